@@ -1,11 +1,70 @@
-from typing import List, Optional, Dict
+import asyncio
+import textwrap
+import time
+from collections import OrderedDict
+from typing import Any, AsyncIterator, List, Optional, Dict, Tuple, Union
 from urllib.parse import urlparse
 
+import httpx
+from botocore.config import Config
 from langchain.agents import create_agent
 from langchain_aws import ChatBedrockConverse
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import AIMessageChunk, HumanMessage, SystemMessage
 from langchain_mcp_adapters.client import MultiServerMCPClient
 
+# static system instruction, dedented once at import so every
+# invocation re-uses the exact same (cacheable) token prefix
+SYSTEM_PROMPT = textwrap.dedent("""
+    You are a personal assistant backed by long-term memory tools.
+    Use the available MCP tools to store or recall the user's notes whenever
+    the request calls for it, and answer directly otherwise. Keep responses
+    concise and grounded in the retrieved notes.
+""").strip()
+
+# model families that support Bedrock prompt caching via `cachePoint` content blocks
+# see https://docs.aws.amazon.com/bedrock/latest/userguide/prompt-caching.html
+CACHEABLE_MODEL_FAMILIES = (
+    "anthropic.claude-3-5",
+    "anthropic.claude-3-7",
+    "anthropic.claude-sonnet",
+    "anthropic.claude-haiku",
+    "anthropic.claude-opus",
+    "amazon.nova",
+)
+
+# keep Bedrock sockets alive between warm invocations so repeat calls
+# skip the TCP+TLS handshake; fail fast rather than retry at length
+BEDROCK_CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    retries={"max_attempts": 2},
+)
+
+
+def _mcp_http_client_factory(
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[httpx.Timeout] = None,
+        auth: Optional[httpx.Auth] = None,
+) -> httpx.AsyncClient:
+    """
+    Builds the httpx client backing the MCP streamable-http transport with
+    generous keep-alive limits, so successive tool calls within and across
+    requests reuse pooled connections instead of re-handshaking TLS.
+    :param headers: HTTP headers applied to all requests of this client.
+    :param timeout: Optional timeout configuration for the client.
+    :param auth: Optional authentication hook for the client.
+    :return: A connection-pooling asynchronous HTTP client.
+    """
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=timeout if timeout is not None else httpx.Timeout(30),
+        auth=auth,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_keepalive_connections=20,
+            keepalive_expiry=300,
+        ),
+    )
+
 
 class Agent:
     """
@@ -21,6 +80,10 @@ class Agent:
             llm_model: str = "global.amazon.nova-2-lite-v1:0",
             llm_model_temperature: float = 0.2,
             llm_model_max_tokens: int = 512,
+            tools_cache_ttl: float = 300,
+            response_cache_ttl: float = 0,
+            response_cache_size: int = 128,
+            debug: bool = False,
     ) -> None:
         """
         Constructor.
@@ -29,15 +92,41 @@ class Agent:
         :param llm_model: AWS Bedrock model identifier.
         :param llm_model_temperature: Sampling temperature for the LLM.
         :param llm_model_max_tokens: Maximum number of tokens to generate in a response.
+        :param tools_cache_ttl: Seconds for which discovered MCP tools are reused
+            before being re-fetched; tool catalogs are effectively static.
+        :param response_cache_ttl: Seconds for which answers to identical repeat
+            prompts are replayed without invoking the LLM or tools. Disabled by
+            default (0) since cached answers skip note writes and fresh recalls.
+        :param response_cache_size: Maximum number of cached prompt/answer pairs.
+        :param debug: Enables verbose LangChain agent logging; adds per-node
+            overhead, so keep disabled in production.
         """
+        self.debug = debug
 
         # initialize Bedrock client
         self.llm = ChatBedrockConverse(
             model=llm_model,
             temperature=llm_model_temperature,
-            max_tokens=llm_model_max_tokens
+            max_tokens=llm_model_max_tokens,
+            config=BEDROCK_CLIENT_CONFIG
         )
 
+        # compose system prompt; append a Bedrock cache point after the static
+        # instruction so warm calls replay the prefix from the KV cache
+        self.prompt_caching = any(family in llm_model for family in CACHEABLE_MODEL_FAMILIES)
+        self.system_prompt = self._build_system_prompt()
+
+        # discovered tools survive across warm invocations until the TTL lapses,
+        # and the compiled agent graph is reused for as long as they do
+        self.tools_cache_ttl = tools_cache_ttl
+        self._tools_cache: Optional[Tuple[float, List]] = None
+        self._agent_cache: Optional[Tuple[Tuple[str, ...], Any]] = None
+
+        # identical repeat prompts short-circuit the whole pipeline when enabled
+        self.response_cache_ttl = response_cache_ttl
+        self.response_cache_size = response_cache_size
+        self._response_cache: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+
         # initialize MCP client
         # see https://pypi.org/project/langchain-mcp-adapters/
         self.mcp = MultiServerMCPClient({
@@ -45,12 +134,162 @@ class Agent:
                 "transport": "streamable_http",
                 "headers": mcp_headers or {},
                 "url": mcp_endpoint,
+                "httpx_client_factory": _mcp_http_client_factory,
             }
             for mcp_endpoint
             in mcp_endpoints
         })
 
 
+    def _build_system_prompt(self) -> Union[str, SystemMessage]:
+        """
+        Composes the system prompt, injecting a `cachePoint` content block after
+        the static instruction when the model supports Bedrock prompt caching.
+        Unsupported models receive a plain string.
+        :return: System prompt, either plain or with an explicit cache checkpoint.
+        """
+
+        # fall back to a plain prompt for models without prompt caching
+        if not self.prompt_caching:
+            return SYSTEM_PROMPT
+
+        # mark the static prefix as cacheable
+        return SystemMessage(
+            content=[
+                {"type": "text", "text": SYSTEM_PROMPT},
+                {"cachePoint": {"type": "default"}},
+            ]
+        )
+
+    def _build_user_prompt(self, prompt: str) -> HumanMessage:
+        """
+        Composes the user message, appending a second cache checkpoint after the
+        question when the model supports Bedrock prompt caching. The agent loop
+        re-sends the system + user prefix on every post-tool turn, so the
+        checkpoint lets those turns replay it from the KV cache.
+        :param prompt: User-defined natural language prompt.
+        :return: User message, optionally with an explicit cache checkpoint.
+        """
+
+        # fall back to a plain message for models without prompt caching
+        if not self.prompt_caching:
+            return HumanMessage(content=prompt)
+
+        # mark the prefix up to and including the question as cacheable
+        return HumanMessage(
+            content=[
+                {"type": "text", "text": prompt},
+                {"cachePoint": {"type": "default"}},
+            ]
+        )
+
+    async def _get_tools(self) -> List:
+        """
+        Discovers tools from all configured MCP endpoints concurrently. A plain
+        `get_tools()` visits endpoints one after another, so discovery latency
+        grows linearly with their count; fanning out with `asyncio.gather`
+        collapses it to the slowest endpoint while preserving endpoint order.
+        Results are cached for `tools_cache_ttl` seconds, turning the discovery
+        round-trips into a local lookup on warm invocations.
+        :return: Tools advertised by all configured MCP endpoints.
+        """
+
+        # serve from cache while the TTL holds
+        if self._tools_cache is not None:
+            cached_at, tools = self._tools_cache
+            if time.monotonic() - cached_at < self.tools_cache_ttl:
+                return tools
+
+        # fan out discovery, one request per endpoint
+        tools_per_endpoint = await asyncio.gather(*(
+            self.mcp.get_tools(server_name=endpoint)
+            for endpoint
+            in self.mcp.connections
+        ))
+
+        # flatten into a single tool list and cache it
+        tools = [
+            tool
+            for endpoint_tools in tools_per_endpoint
+            for tool in endpoint_tools
+        ]
+        self._tools_cache = (time.monotonic(), tools)
+        return tools
+
+    def _get_agent(self, tools: List) -> Any:
+        """
+        Yields the LangChain agent for the given tools, compiling the underlying
+        LangGraph state machine only when the tool set changes. Recompiling per
+        request is pure CPU on the hot path for an input-independent result.
+        :param tools: Tools the agent may invoke.
+        :return: A compiled LangChain agent graph.
+        """
+
+        # reuse the compiled graph while the tool set is unchanged
+        signature = tuple(tool.name for tool in tools)
+        if self._agent_cache is not None and self._agent_cache[0] == signature:
+            return self._agent_cache[1]
+
+        # compile and cache the agent graph
+        agent = create_agent(
+            model=self.llm,
+            tools=tools,
+            system_prompt=self.system_prompt,
+            debug=self.debug
+        )
+        self._agent_cache = (signature, agent)
+        return agent
+
+    def _cached_response(self, prompt: str) -> Optional[str]:
+        """
+        Looks up a previously generated answer for an identical prompt, honouring
+        the configured TTL. Expired and least-recently-used entries are evicted.
+        :param prompt: User-defined natural language prompt.
+        :return: The cached answer, or None on a miss or when caching is disabled.
+        """
+        if not self.response_cache_ttl:
+            return None
+
+        cached = self._response_cache.get(prompt.strip())
+        if cached is None:
+            return None
+
+        # discard stale hits
+        cached_at, response = cached
+        if time.monotonic() - cached_at >= self.response_cache_ttl:
+            del self._response_cache[prompt.strip()]
+            return None
+
+        self._response_cache.move_to_end(prompt.strip())
+        return response
+
+    def _cache_response(self, prompt: str, response: str) -> None:
+        """
+        Stores a generated answer for reuse by identical repeat prompts, evicting
+        the least recently used entry once the cache is full.
+        :param prompt: User-defined natural language prompt.
+        :param response: Answer generated by the agent for the prompt.
+        :return: None
+        """
+        if not self.response_cache_ttl:
+            return
+
+        self._response_cache[prompt.strip()] = (time.monotonic(), response)
+        self._response_cache.move_to_end(prompt.strip())
+        while len(self._response_cache) > self.response_cache_size:
+            self._response_cache.popitem(last=False)
+
+    async def warm_up(self) -> None:
+        """
+        Primes the agent ahead of the first request: discovers tools from all
+        MCP endpoints in parallel and compiles the agent graph. Intended to run
+        at module import so cold starts pay this cost during the INIT phase
+        instead of on the first user-facing invocation.
+        :return: None
+        """
+        tools = await self._get_tools()
+        self._get_agent(tools)
+
     async def invoke(self, prompt: str) -> str:
         """
         Executes the provided prompt against a LangChain agent backed by AWS Bedrock and MCP tools.
@@ -59,23 +298,45 @@ class Agent:
         :return: Textual response generated by the agent.
         """
 
+        # replay the answer for identical repeat prompts, when enabled
+        cached_response = self._cached_response(prompt)
+        if cached_response is not None:
+            return cached_response
+
         # initialize agent, through LangChain
-        tools = await self.mcp.get_tools()
-        agent = create_agent(
-            model=self.llm,
-            tools=tools,
-            debug=True
-        )
+        tools = await self._get_tools()
+        agent = self._get_agent(tools)
 
         # invoke the agent with the user provided input
         responses = await agent.ainvoke({ # type: ignore[arg-type]
             "messages": [
-                HumanMessage(
-                    content=prompt
-                )
+                self._build_user_prompt(prompt)
             ]
         })
 
         # return the most recent message content
         last_message = responses["messages"][-1]
-        return getattr(last_message, "content", "")
+        response = getattr(last_message, "content", "")
+        self._cache_response(prompt, response)
+        return response
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Streams the agent's answer for the provided prompt, token by token, instead
+        of buffering the full response. This cuts time-to-first-byte to a single
+        LLM prefill rather than the complete tool-augmented roundtrip.
+        :param prompt: User-defined natural language prompt to be processed by the agent.
+        :return: Asynchronous iterator over textual response fragments.
+        """
+
+        # initialize agent, through LangChain
+        tools = await self._get_tools()
+        agent = self._get_agent(tools)
+
+        # forward LLM token chunks as they arrive, skipping tool traffic
+        async for chunk, _ in agent.astream( # type: ignore[arg-type]
+            {"messages": [self._build_user_prompt(prompt)]},
+            stream_mode="messages",
+        ):
+            if isinstance(chunk, AIMessageChunk) and chunk.text:
+                yield chunk.text
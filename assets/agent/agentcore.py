@@ -1,6 +1,6 @@
 import asyncio
 import os
-from typing import Dict, Any
+from typing import Any, AsyncIterator, Dict, Union
 
 from bedrock_agentcore import BedrockAgentCoreApp, RequestContext
 
@@ -14,8 +14,16 @@ agent = Agent(
     mcp_endpoints=os.environ["MCP_ENDPOINTS"].split(","),
     mcp_headers={"X-API-Key": os.environ["API_KEY"]},
     llm_model=os.environ["LLM_MODEL"],
+    response_cache_ttl=float(os.environ.get("RESPONSE_CACHE_TTL", "0")),
 )
 
+# prime tool discovery and graph compilation during INIT; best-effort,
+# the first request simply repeats the work should the warm-up fail
+try:
+    asyncio.run(agent.warm_up())
+except Exception:
+    pass
+
 # -----------------------
 # Bedrock handler
 # -----------------------
@@ -23,26 +31,29 @@ agent = Agent(
 app = BedrockAgentCoreApp()
 
 @app.entrypoint
-def handler(
+async def handler(
         payload: Dict[str, Any],
         context: RequestContext,
-) -> Dict[str, Any]:
+) -> Union[Dict[str, Any], AsyncIterator[str]]:
     """
     AgentCore entrypoint that invokes an MCP-enabled LangChain agent.
     @param payload: A dictionary representing the request payload. It must contain
         a `prompt` field with the natural-language input to be processed by the
-        agent. Additional fields may be included but are optional.
+        agent. An optional `stream` flag requests a streamed, token-by-token
+        response instead of a buffered one.
     @param context: Request metadata provided by AgentCore, including the session identifier
         (``context.session_id``), HTTP headers, and the underlying request object.
-    @return: A dictionary containing the agent's response. On success, the result
-        is returned under the `result` key.
+    @return: A dictionary containing the agent's response under the `result` key,
+        or an asynchronous iterator of response fragments when streaming.
     """
 
-    # invoke agent asynchronously
-    response = asyncio.run(
-        main=agent.invoke(
-            prompt=payload["prompt"],
-        )
+    # stream tokens as they arrive, when requested
+    if payload.get("stream"):
+        return agent.stream(prompt=payload["prompt"])
+
+    # otherwise invoke agent and buffer the full response
+    response = await agent.invoke(
+        prompt=payload["prompt"],
     )
 
     # format AgentCore response
@@ -15,8 +15,20 @@ agent = Agent(
     mcp_endpoints=os.environ["MCP_ENDPOINTS"].split(","),
     mcp_headers={"X-API-Key": os.environ["API_KEY"]},
     llm_model=os.environ["LLM_MODEL"],
+    response_cache_ttl=float(os.environ.get("RESPONSE_CACHE_TTL", "0")),
 )
 
+# reuse one event loop across warm invocations; asyncio.run would build and
+# tear down a loop per request, orphaning loop-bound clients in between
+loop = asyncio.new_event_loop()
+
+# prime tool discovery and graph compilation during INIT; best-effort,
+# the first request simply repeats the work should the warm-up fail
+try:
+    loop.run_until_complete(agent.warm_up())
+except Exception:
+    pass
+
 
 # -----------------------
 # Lambda handler
@@ -34,9 +46,9 @@ def handler(
     @return: The response produced by the asynchronous handler, formatted as a dictionary
     """
 
-    # invoke agent asynchronously
-    response = asyncio.run(
-        main=agent.invoke(
+    # invoke agent asynchronously, on the shared event loop
+    response = loop.run_until_complete(
+        agent.invoke(
             prompt=event.body
         )
     )
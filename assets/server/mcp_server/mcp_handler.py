@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import base64
 import inspect
 import json
 import logging
@@ -40,7 +41,6 @@ from .models import (
     ImageContent,
     InitializeResult,
     JSONRPCError,
-    JSONRPCRequest,
     JSONRPCResponse,
     Resource,
     ResourceContent,
@@ -56,11 +56,73 @@ from .session import (
 
 logger = logging.getLogger(__name__)
 
+# constant response headers, copied per response instead of rebuilt literal-by-literal
+_BASE_HEADERS = {"Content-Type": "application/json", "MCP-Version": "0.6"}
+
+# JSON-RPC error code -> HTTP status
+_ERROR_STATUS = {
+    -32700: 400,
+    -32600: 400,
+    -32601: 404,
+    -32602: 400,
+    -32603: 500,
+}
+
+# first-byte dispatch table for MIME sniffing of binary tool results; each
+# entry lists candidate (prefix, mime type, optional extra predicate) triples
+_SNIFFERS = {
+    0xFF: ((b"\xff\xd8\xff", "image/jpeg", None),),
+    0x89: ((b"\x89PNG\r\n\x1a\n", "image/png", None),),
+    0x47: ((b"GIF87a", "image/gif", None), (b"GIF89a", "image/gif", None)),
+    0x52: ((b"RIFF", "image/webp", lambda result: result[8:12] == b"WEBP"),),
+}
+
 # Context variable to store current session ID
 current_session_id: ContextVar[Optional[str]] = ContextVar("current_session_id", default=None)
 
+# Session data fetched while validating the current request, reused by tools
+# so a single request costs one session read instead of two or three
+current_session_data: ContextVar[Optional[Dict[str, Any]]] = ContextVar("current_session_data", default=None)
+
 T = TypeVar("T")
 
+# scalar type hint -> JSON schema fragment, shared by tool and prompt registration
+_TYPE_SCHEMA_TABLE = {
+    int: {"type": "integer"},
+    float: {"type": "number"},
+    bool: {"type": "boolean"},
+    str: {"type": "string"},
+}
+
+
+def _get_header(headers: Dict[str, str], name: str) -> Optional[str]:
+    """Case-insensitive lookup of a single header, without copying the whole dict."""
+    value = headers.get(name)
+    if value is not None:
+        return value
+    return next((v for k, v in headers.items() if k.lower() == name), None)
+
+
+def _get_type_schema(type_hint: Any) -> Dict[str, Any]:
+    """Map a type hint onto its JSON schema fragment."""
+    schema = _TYPE_SCHEMA_TABLE.get(type_hint)
+    if schema is not None:
+        return dict(schema)
+    if isinstance(type_hint, type) and issubclass(type_hint, Enum):
+        return {"type": "string", "enum": [e.value for e in type_hint]}
+    origin = get_origin(type_hint)
+    if origin is None:
+        return {"type": "string"}
+    if origin in (dict, Dict):
+        args = get_args(type_hint)
+        value_schema = _get_type_schema(args[1]) if len(args) > 1 else {"type": "string"}
+        return {"type": "object", "additionalProperties": value_schema}
+    if origin in (list, List):
+        args = get_args(type_hint)
+        item_schema = _get_type_schema(args[0]) if args else {"type": "string"}
+        return {"type": "array", "items": item_schema}
+    return {"type": "string"}
+
 
 class SessionData(Generic[T]):
     """Helper class for type-safe session data access."""
@@ -95,10 +157,37 @@ class MCPLambdaHandler:
         self.name = name
         self.version = version
         self.tools: Dict[str, Dict] = {}
-        self.tool_implementations: Dict[str, Callable] = {}
+        # tool name -> (implementation, {param name -> Enum subclass});
+        # hints are resolved once at registration, never on the call path
+        self.tool_implementations: Dict[str, tuple] = {}
         self.resources: Dict[str, Resource] = {}
         self.prompts: Dict[str, Dict] = {}
         self.prompt_implementations: Dict[str, Callable] = {}
+        # method -> pre-serialized JSON result for the static list catalogs;
+        # entries are dropped on registration and rebuilt on first request
+        self._list_cache: Dict[str, str] = {}
+        # JSON-RPC method -> bound handler; O(1) dispatch instead of an if/elif cascade.
+        # `initialize` stays special-cased in handle_request, ahead of the session check.
+        self._dispatch: Dict[str, Callable[..., Dict]] = {
+            "tools/list": self._handle_tools_list,
+            "tools/call": self._handle_tools_call,
+            "prompts/list": self._handle_prompts_list,
+            "prompts/get": self._handle_prompts_get,
+            "resources/list": self._handle_resources_list,
+            "resources/read": self._handle_resources_read,
+            "ping": self._handle_ping,
+        }
+        # everything in the initialize result except the session id is fixed
+        # at construction time, so dump it once and reuse per session
+        self._initialize_result = InitializeResult(
+            protocolVersion="2024-11-05",
+            serverInfo=ServerInfo(name=self.name, version=self.version),
+            capabilities=Capabilities(
+                tools={"list": True, "call": True},
+                resources={"list": True, "read": True},
+                prompts={"list": True, "get": True},
+            ),
+        ).model_dump()
 
         # Configure session storage
         if session_store is None:
@@ -115,13 +204,19 @@ class MCPLambdaHandler:
         session_id = current_session_id.get()
         if not session_id:
             return None
-        data = self.session_store.get_session(session_id)
+        # reuse the copy fetched while validating this request, if any
+        data = current_session_data.get()
+        if data is None:
+            data = self.session_store.get_session(session_id)
+            current_session_data.set(data)
         return SessionData(data) if data is not None else None
 
     def set_session(self, data: Dict[str, Any]) -> bool:
         session_id = current_session_id.get()
         if not session_id:
             return False
+        # keep the request-scoped copy in sync with the store
+        current_session_data.set(data)
         return self.session_store.update_session(session_id, data)
 
     def update_session(self, updater_func: Callable[[SessionData], None]) -> bool:
@@ -147,40 +242,25 @@ class MCPLambdaHandler:
             properties = {}
             required = []
 
-            def get_type_schema(type_hint: Any) -> Dict[str, Any]:
-                if type_hint is int:
-                    return {"type": "integer"}
-                elif type_hint is float:
-                    return {"type": "number"}
-                elif type_hint is bool:
-                    return {"type": "boolean"}
-                elif type_hint is str:
-                    return {"type": "string"}
-                if isinstance(type_hint, type) and issubclass(type_hint, Enum):
-                    return {"type": "string", "enum": [e.value for e in type_hint]}
-                origin = get_origin(type_hint)
-                if origin is None:
-                    return {"type": "string"}
-                if origin in (dict, Dict):
-                    args = get_args(type_hint)
-                    value_schema = get_type_schema(args[1]) if len(args) > 1 else {"type": "string"}
-                    return {"type": "object", "additionalProperties": value_schema}
-                if origin in (list, List):
-                    args = get_args(type_hint)
-                    item_schema = get_type_schema(args[0]) if args else {"type": "string"}
-                    return {"type": "array", "items": item_schema}
-                return {"type": "string"}
-
             for param_name, param_type in hints.items():
-                properties[param_name] = get_type_schema(param_type)
+                properties[param_name] = _get_type_schema(param_type)
                 required.append(param_name)
 
+            # precompute the Enum-typed parameter subset so tools/call converts
+            # arguments with a dict lookup instead of per-call reflection
+            enum_params = {
+                param_name: param_type
+                for param_name, param_type in hints.items()
+                if isinstance(param_type, type) and issubclass(param_type, Enum)
+            }
+
             self.tools[tool_name] = {
                 "name": tool_name,
                 "description": tool_description,
                 "inputSchema": {"type": "object", "properties": properties, "required": required},
             }
-            self.tool_implementations[tool_name] = func
+            self.tool_implementations[tool_name] = (func, enum_params)
+            self._list_cache.pop("tools/list", None)
             return func
 
         return decorator
@@ -201,17 +281,7 @@ class MCPLambdaHandler:
             required = []
 
             for param_name, param_type in hints.items():
-                if param_type is str:
-                    schema = {"type": "string"}
-                elif param_type is int:
-                    schema = {"type": "integer"}
-                elif param_type is float:
-                    schema = {"type": "number"}
-                elif param_type is bool:
-                    schema = {"type": "boolean"}
-                else:
-                    schema = {"type": "string"}
-                properties[param_name] = schema
+                properties[param_name] = dict(_TYPE_SCHEMA_TABLE.get(param_type, {"type": "string"}))
                 required.append(param_name)
 
             self.prompts[prompt_name] = {
@@ -220,6 +290,7 @@ class MCPLambdaHandler:
                 "inputSchema": {"type": "object", "properties": properties, "required": required},
             }
             self.prompt_implementations[prompt_name] = func
+            self._list_cache.pop("prompts/list", None)
             return func
 
         return decorator
@@ -229,6 +300,7 @@ class MCPLambdaHandler:
     # ---------------------------
     def add_resource(self, resource: Resource) -> None:
         self.resources[resource.uri] = resource
+        self._list_cache.pop("resources/list", None)
 
     def resource(self, uri: str, name: str, description: Optional[str] = None, mime_type: Optional[str] = None):
         def decorator(func: Callable):
@@ -237,6 +309,7 @@ class MCPLambdaHandler:
             )
             resource._content_func = func
             self.resources[uri] = resource
+            self._list_cache.pop("resources/list", None)
             return func
 
         return decorator
@@ -255,7 +328,7 @@ class MCPLambdaHandler:
     ) -> Dict:
         error = JSONRPCError(code=code, message=message)
         response = JSONRPCResponse(jsonrpc="2.0", id=request_id, error=error, errorContent=error_content)
-        headers = {"Content-Type": "application/json", "MCP-Version": "0.6"}
+        headers = dict(_BASE_HEADERS)
         if session_id:
             headers["MCP-Session-Id"] = session_id
         return {
@@ -265,51 +338,133 @@ class MCPLambdaHandler:
         }
 
     def _error_code_to_http_status(self, error_code: int) -> int:
-        return {
-            -32700: 400,
-            -32600: 400,
-            -32601: 404,
-            -32602: 400,
-            -32603: 500,
-        }.get(error_code, 500)
+        return _ERROR_STATUS.get(error_code, 500)
 
     def _convert_result_to_content(self, result: Any) -> List[Dict]:
-
-        if isinstance(result, list):
-            return [
-                content_item  # each individual content object
-                for result_item in result  # each raw result from the tool/prompt
-                for content_item in self._convert_result_to_content(result_item)
-            ]
-
-        if isinstance(result, ToolResult):
-            return [result.content[0].model_dump()]
-
-        if isinstance(result, PromptMessage):
-            return [result.model_dump()]
-
-        if isinstance(result, bytes):
-            import base64
-            mime_type = "application/octet-stream"
-            if result.startswith(b"\xff\xd8\xff"):
-                mime_type = "image/jpeg"
-            elif result.startswith(b"\x89PNG\r\n\x1a\n"):
-                mime_type = "image/png"
-            elif result.startswith(b"GIF87a") or result.startswith(b"GIF89a"):
-                mime_type = "image/gif"
-            elif result.startswith(b"RIFF") and result[8:12] == b"WEBP":
-                mime_type = "image/webp"
-            base64_data = base64.b64encode(result).decode("utf-8")
-            return [ImageContent(data=base64_data, mimeType=mime_type).model_dump()]
-        return [TextContent(text=str(result)).model_dump()]
+        # iterative traversal: nested lists are flattened via an explicit stack,
+        # so arbitrarily shaped results are converted in a single pass
+        converted: List[Dict] = []
+        stack = [result]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, list):
+                stack.extend(reversed(item))
+            elif isinstance(item, ToolResult):
+                converted.append(item.content[0].model_dump())
+            elif isinstance(item, PromptMessage):
+                converted.append(item.model_dump())
+            elif isinstance(item, bytes):
+                mime_type = "application/octet-stream"
+                candidates = _SNIFFERS.get(item[0], ()) if item else ()
+                for prefix, sniffed_mime, predicate in candidates:
+                    if item.startswith(prefix) and (predicate is None or predicate(item)):
+                        mime_type = sniffed_mime
+                        break
+                base64_data = base64.b64encode(item).decode("utf-8")
+                converted.append(ImageContent(data=base64_data, mimeType=mime_type).model_dump())
+            else:
+                converted.append(TextContent(text=str(item)).model_dump())
+        return converted
+
+    def _cached_list_response(
+        self, method: str, build_result: Callable[[], Dict], request_id: str | None, session_id: Optional[str] = None
+    ) -> Dict:
+        """Serve a list request from the pre-serialized catalog, splicing in only the request id."""
+        result_json = self._list_cache.get(method)
+        if result_json is None:
+            result_json = json.dumps(build_result())
+            self._list_cache[method] = result_json
+        headers = dict(_BASE_HEADERS)
+        if session_id:
+            headers["MCP-Session-Id"] = session_id
+        body = '{"jsonrpc": "2.0", "id": ' + json.dumps(request_id) + ', "result": ' + result_json + "}"
+        return {"statusCode": 200, "body": body, "headers": headers}
 
     def _create_success_response(self, result: Any, request_id: str | None, session_id: Optional[str] = None) -> Dict:
         response = JSONRPCResponse(jsonrpc="2.0", id=request_id, result=result)
-        headers = {"Content-Type": "application/json", "MCP-Version": "0.6"}
+        headers = dict(_BASE_HEADERS)
         if session_id:
             headers["MCP-Session-Id"] = session_id
         return {"statusCode": 200, "body": response.model_dump_json(), "headers": headers}
 
+    # ---------------------------
+    # Method Handlers
+    # ---------------------------
+    def _handle_tools_list(self, request_id: Optional[str], params: Optional[Dict], session_id: Optional[str]) -> Dict:
+        return self._cached_list_response(
+            "tools/list", lambda: {"tools": list(self.tools.values())}, request_id, session_id
+        )
+
+    def _handle_tools_call(self, request_id: Optional[str], params: Optional[Dict], session_id: Optional[str]) -> Dict:
+        if not params:
+            return self._create_error_response(-32601, "Method not found: tools/call", request_id, session_id=session_id)
+        tool_name = params.get("name")
+        tool_args = params.get("arguments", {})
+        if tool_name not in self.tools:
+            return self._create_error_response(-32601, f"Tool '{tool_name}' not found", request_id, session_id=session_id)
+        try:
+            tool_func, enum_params = self.tool_implementations[tool_name]
+            converted_args = {}
+            for arg_name, arg_value in tool_args.items():
+                enum_cls = enum_params.get(arg_name)
+                converted_args[arg_name] = enum_cls(arg_value) if enum_cls else arg_value
+            result = tool_func(**converted_args)
+            content = self._convert_result_to_content(result)
+            return self._create_success_response({"content": content}, request_id, session_id)
+        except Exception as e:
+            logger.exception(f"Error executing tool {tool_name}")
+            return self._create_error_response(-32603, f"Error executing tool: {str(e)}", request_id, [ErrorContent(text=str(e)).model_dump()], session_id)
+
+    def _handle_prompts_list(self, request_id: Optional[str], params: Optional[Dict], session_id: Optional[str]) -> Dict:
+        return self._cached_list_response(
+            "prompts/list", lambda: {"prompts": list(self.prompts.values())}, request_id, session_id
+        )
+
+    def _handle_prompts_get(self, request_id: Optional[str], params: Optional[Dict], session_id: Optional[str]) -> Dict:
+        if not params:
+            return self._create_error_response(-32601, "Method not found: prompts/get", request_id, session_id=session_id)
+        prompt_name = params.get("name")
+        prompt_args = params.get("arguments", {})
+        if prompt_name not in self.prompts:
+            return self._create_error_response(-32601, f"Prompt '{prompt_name}' not found", request_id, session_id=session_id)
+        try:
+            prompt_func = self.prompt_implementations[prompt_name]
+            result = prompt_func(**prompt_args)
+            content = self._convert_result_to_content(result)
+            return self._create_success_response({"messages": content}, request_id, session_id)
+        except Exception as e:
+            logger.exception(f"Error executing prompt {prompt_name}")
+            return self._create_error_response(-32603, f"Error executing prompt: {str(e)}", request_id, [ErrorContent(text=str(e)).model_dump()], session_id)
+
+    def _handle_resources_list(self, request_id: Optional[str], params: Optional[Dict], session_id: Optional[str]) -> Dict:
+        return self._cached_list_response(
+            "resources/list",
+            lambda: {"resources": [r.model_dump() for r in self.resources.values()]},
+            request_id,
+            session_id,
+        )
+
+    def _handle_resources_read(self, request_id: Optional[str], params: Optional[Dict], session_id: Optional[str]) -> Dict:
+        if not params or not params.get("uri"):
+            return self._create_error_response(-32602, "Missing required parameter: uri", request_id, session_id=session_id)
+        resource_uri = params["uri"]
+        if resource_uri not in self.resources:
+            return self._create_error_response(-32601, f"Resource not found: {resource_uri}", request_id, session_id=session_id)
+        resource = self.resources[resource_uri]
+        try:
+            if hasattr(resource, "_content_func") and resource._content_func is not None:
+                content = resource._content_func()
+                resource_content = ResourceContent(uri=resource_uri, mimeType=resource.mimeType, text=str(content))
+            else:
+                resource_content = resource.read_content()
+            return self._create_success_response({"contents": [resource_content.model_dump()]}, request_id, session_id)
+        except Exception as e:
+            logger.exception(f"Error reading resource {resource_uri}")
+            return self._create_error_response(-32603, f"Error reading resource: {str(e)}", request_id, [ErrorContent(text=str(e)).model_dump()], session_id)
+
+    def _handle_ping(self, request_id: Optional[str], params: Optional[Dict], session_id: Optional[str]) -> Dict:
+        return self._create_success_response({}, request_id, session_id)
+
     # ---------------------------
     # Request Handling
     # ---------------------------
@@ -317,8 +472,8 @@ class MCPLambdaHandler:
         request_id = None
         session_id = None
         try:
-            headers = {k.lower(): v for k, v in event.get("headers", {}).items()}
-            session_id = headers.get("mcp-session-id")
+            headers = event.get("headers") or {}
+            session_id = _get_header(headers, "mcp-session-id")
             current_session_id.set(session_id or None)
 
             if event.get("httpMethod") == "DELETE" and session_id:
@@ -327,7 +482,7 @@ class MCPLambdaHandler:
                 else:
                     return {"statusCode": 404}
 
-            if headers.get("content-type") != "application/json":
+            if _get_header(headers, "content-type") != "application/json":
                 return self._create_error_response(-32700, "Unsupported Media Type")
 
             try:
@@ -339,108 +494,35 @@ class MCPLambdaHandler:
             if not isinstance(body, dict) or body.get("jsonrpc") != "2.0" or "method" not in body:
                 return self._create_error_response(-32700, "Parse error", request_id)
 
-            request = JSONRPCRequest.model_validate(body)
+            # the sanity check above already guarantees the shape; read the
+            # three fields straight off the dict instead of building a model
+            method = body["method"]
+            params = body.get("params")
 
             # ------------------ initialize ------------------
-            if request.method == "initialize":
+            if method == "initialize":
                 session_id = self.session_store.create_session()
                 current_session_id.set(session_id)
-                result = InitializeResult(
-                    protocolVersion="2024-11-05",
-                    serverInfo=ServerInfo(name=self.name, version=self.version),
-                    capabilities=Capabilities(
-                        tools={"list": True, "call": True},
-                        resources={"list": True, "read": True},
-                        prompts={"list": True, "get": True},
-                    ),
-                )
-                return self._create_success_response(result.model_dump(), request.id, session_id)
+                return self._create_success_response(self._initialize_result, request_id, session_id)
 
             if session_id:
                 session_data = self.session_store.get_session(session_id)
                 if session_data is None:
-                    return self._create_error_response(-32000, "Invalid or expired session", request.id, status_code=404)
+                    return self._create_error_response(-32000, "Invalid or expired session", request_id, status_code=404)
+                current_session_data.set(session_data)
             elif not isinstance(self.session_store, NoOpSessionStore):
-                return self._create_error_response(-32000, "Session required", request.id, status_code=400)
-
-            # ------------------ tools/list ------------------
-            if request.method == "tools/list":
-                return self._create_success_response({"tools": list(self.tools.values())}, request.id, session_id)
-
-            # ------------------ tools/call ------------------
-            if request.method == "tools/call" and request.params:
-                tool_name = request.params.get("name")
-                tool_args = request.params.get("arguments", {})
-                if tool_name not in self.tools:
-                    return self._create_error_response(-32601, f"Tool '{tool_name}' not found", request.id, session_id=session_id)
-                try:
-                    tool_func = self.tool_implementations[tool_name]
-                    hints = get_type_hints(tool_func)
-                    converted_args = {}
-                    for arg_name, arg_value in tool_args.items():
-                        arg_type = hints.get(arg_name)
-                        if isinstance(arg_type, type) and issubclass(arg_type, Enum):
-                            converted_args[arg_name] = arg_type(arg_value)
-                        else:
-                            converted_args[arg_name] = arg_value
-                    result = tool_func(**converted_args)
-                    content = self._convert_result_to_content(result)
-                    return self._create_success_response({"content": content}, request.id, session_id)
-                except Exception as e:
-                    logger.exception(f"Error executing tool {tool_name}")
-                    return self._create_error_response(-32603, f"Error executing tool: {str(e)}", request.id, [ErrorContent(text=str(e)).model_dump()], session_id)
-
-            # ------------------ prompts/list ------------------
-            if request.method == "prompts/list":
-                return self._create_success_response({"prompts": list(self.prompts.values())}, request.id, session_id)
-
-            # ------------------ prompts/get ------------------
-            if request.method == "prompts/get" and request.params:
-                prompt_name = request.params.get("name")
-                prompt_args = request.params.get("arguments", {})
-                if prompt_name not in self.prompts:
-                    return self._create_error_response(-32601, f"Prompt '{prompt_name}' not found", request.id, session_id=session_id)
-                try:
-                    prompt_func = self.prompt_implementations[prompt_name]
-                    result = prompt_func(**prompt_args)
-                    content = self._convert_result_to_content(result)
-                    return self._create_success_response({"messages": content}, request.id, session_id)
-                except Exception as e:
-                    logger.exception(f"Error executing prompt {prompt_name}")
-                    return self._create_error_response(-32603, f"Error executing prompt: {str(e)}", request.id, [ErrorContent(text=str(e)).model_dump()], session_id)
-
-            # ------------------ resources/list ------------------
-            if request.method == "resources/list":
-                return self._create_success_response({"resources": [r.model_dump() for r in self.resources.values()]}, request.id, session_id)
-
-            # ------------------ resources/read ------------------
-            if request.method == "resources/read":
-                if not request.params or not request.params.get("uri"):
-                    return self._create_error_response(-32602, "Missing required parameter: uri", request.id, session_id=session_id)
-                resource_uri = request.params["uri"]
-                if resource_uri not in self.resources:
-                    return self._create_error_response(-32601, f"Resource not found: {resource_uri}", request.id, session_id=session_id)
-                resource = self.resources[resource_uri]
-                try:
-                    if hasattr(resource, "_content_func") and resource._content_func is not None:
-                        content = resource._content_func()
-                        resource_content = ResourceContent(uri=resource_uri, mimeType=resource.mimeType, text=str(content))
-                    else:
-                        resource_content = resource.read_content()
-                    return self._create_success_response({"contents": [resource_content.model_dump()]}, request.id, session_id)
-                except Exception as e:
-                    logger.exception(f"Error reading resource {resource_uri}")
-                    return self._create_error_response(-32603, f"Error reading resource: {str(e)}", request.id, [ErrorContent(text=str(e)).model_dump()], session_id)
-
-            # ------------------ ping ------------------
-            if request.method == "ping":
-                return self._create_success_response({}, request.id, session_id)
-
-            # ------------------ unknown ------------------
-            return self._create_error_response(-32601, f"Method not found: {request.method}", request.id, session_id=session_id)
+                return self._create_error_response(-32000, "Session required", request_id, status_code=400)
+
+            # ------------------ dispatch ------------------
+            handler = self._dispatch.get(method)
+            if handler is None:
+                return self._create_error_response(-32601, f"Method not found: {method}", request_id, session_id=session_id)
+            return handler(request_id, params, session_id)
 
         except Exception as e:
-            logger.exception("Error processing request")
+            if logger.isEnabledFor(logging.ERROR):
+                logger.exception("Error processing request")
             return self._create_error_response(-32000, str(e), request_id, session_id=session_id)
         finally:
             current_session_id.set(None)
+            current_session_data.set(None)
@@ -25,16 +25,17 @@ class JSONRPCError:
     message: str
     data: Optional[Any] = None
 
+    def model_dump(self) -> Dict:
+        return {
+            'code': self.code,
+            'message': self.message,
+            **({'data': self.data} if self.data is not None else {}),
+        }
+
     def model_dump_json(self) -> str:
         import json
 
-        return json.dumps(
-            {
-                'code': self.code,
-                'message': self.message,
-                **({'data': self.data} if self.data is not None else {}),
-            }
-        )
+        return json.dumps(self.model_dump())
 
 
 @dataclass
@@ -52,7 +53,7 @@ class JSONRPCResponse:
         if self.result is not None:
             data['result'] = self.result
         if self.error is not None:
-            data['error'] = json.loads(self.error.model_dump_json())
+            data['error'] = self.error.model_dump()
         if self.errorContent is not None:
             data['errorContent'] = self.errorContent
         return json.dumps(data)
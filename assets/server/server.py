@@ -1,13 +1,17 @@
-import datetime
+import collections
+import concurrent.futures
+import functools
 import json
 import logging
 import os
+import random
 import textwrap
-import uuid
-from dataclasses import dataclass, asdict
+import time
+from dataclasses import dataclass
 from typing import Annotated
 
 import boto3
+from botocore.config import Config
 from fastmcp.tools.tool import ToolResult
 
 # -------------------------
@@ -16,10 +20,23 @@ from fastmcp.tools.tool import ToolResult
 
 DEPLOYMENT_MODE = os.environ.get("DEPLOYMENT_MODE", "lambda")
 EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL", "amazon.titan-embed-text-v2:0")
+# must match the dimension of the vector index; Titan v2 supports 256/512/1024
+EMBEDDING_DIMENSIONS = int(os.environ.get("EMBEDDING_DIMENSIONS", "1024"))
 
 VECTOR_BUCKET_NAME = os.environ.get("VECTOR_BUCKET_NAME", "test-s3-vector-bucket")
 VECTOR_INDEX_NAME = os.environ.get("VECTOR_INDEX_NAME", "memories")
 
+# bound on memoized embeddings; ~4KB each at 1024 dimensions
+EMBED_CACHE_SIZE = int(os.environ.get("EMBED_CACHE_SIZE", "1024"))
+
+# default number of matches returned by note_find
+RECALL_TOP_K = int(os.environ.get("RECALL_TOP_K", "5"))
+
+# fraction of requests that emit the triggered log line
+LOG_SAMPLE = float(os.environ.get("LOG_SAMPLE", "0.01"))
+
+_log = logging.getLogger(__name__)
+
 # -------------------------
 # Initialize MCP server
 # -------------------------
@@ -43,26 +60,72 @@ else:
 # Define MCP model entities
 # -------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Note:
     """
     Represents a single entry in the user's notebook.
     :param content: The textual content of the note.
-    :param created: Timestamp indicating when the note was created.
+    :param created: Unix timestamp, in seconds, indicating when the note was created.
     :param distance: Cosine distance from a reference vector, where
         0 indicates identical similarity and 1 indicates complete dissimilarity.
         Defaults to 0.
     """
     content: str
-    created: datetime
+    created: int
     distance: float = 0
 
+    def to_dict(self) -> dict:
+        """
+        Yields the note as a plain dict, cheaper than dataclasses.asdict
+        which deep-copies every field recursively.
+        :return: The note fields as a dict.
+        """
+        return {
+            "content": self.content,
+            "created": self.created,
+            "distance": self.distance,
+        }
+
 # -------------------------
 # Initialize AWS clients
 # -------------------------
 
-bedrock = boto3.client("bedrock-runtime")
-s3_vectors = boto3.client("s3vectors")
+# shared client configuration: keep-alive sockets survive warm invocations,
+# a widened connection pool avoids head-of-line blocking under bursts, and
+# explicit timeouts fail fast instead of hanging a 30s Lambda invocation
+_BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+    tcp_keepalive=True,
+    connect_timeout=1,
+    read_timeout=15
+)
+
+# one session shared by both clients, created at import so the Lambda INIT
+# phase absorbs credential resolution and the TLS handshakes
+_session = boto3.Session()
+bedrock = _session.client("bedrock-runtime", config=_BOTO_CONFIG)
+s3_vectors = _session.client("s3vectors", config=_BOTO_CONFIG)
+
+# static tail of the Titan embedding request, rendered once at import;
+# per-call serialization reduces to escaping the input text itself
+_EMBED_BODY_SUFFIX = f',"dimensions":{EMBEDDING_DIMENSIONS},"normalize":true}}'
+
+# vectors buffered by note_take and written in a single PUT per request;
+# S3 Vectors accepts up to 500 vectors per put_vectors call
+_pending_vectors = []
+
+# full batches are handed to a background writer so the PUT overlaps with
+# the remainder of request handling; outstanding writes are joined at flush
+_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+_pending_writes = []
+FLUSH_THRESHOLD = 100
+
+# contexts that recently produced no matches; repeat recalls within the TTL
+# skip the embedding call and the index query outright
+_empty_recalls = collections.OrderedDict()
+EMPTY_RECALL_TTL = 60
+EMPTY_RECALL_SIZE = 256
 
 # -------------------------
 # Define MCP tools
@@ -98,29 +161,35 @@ def note_take(
     # compose note to be persisted
     note = Note(
         content=content,
-        created=datetime.datetime.now()
+        created=int(time.time())
     )
 
-    # write embeddings into vector index with metadata
-    embeddings = _get_embeddings(content)
-    s3_vectors.put_vectors(
-        vectorBucketName=VECTOR_BUCKET_NAME,
-        indexName=VECTOR_INDEX_NAME,
-        vectors=[
-            {
-                "key": uuid.uuid4().hex,
-                "data": {"float32": embeddings},
-                "metadata": {
-                    "content": note.content,
-                    "created": note.created.isoformat(),
-                }
+    # buffer embeddings for a batched write into the vector index
+    embeddings = list(_get_embeddings(content))
+    _pending_vectors.append(
+        {
+            "key": os.urandom(16).hex(),
+            "data": {"float32": embeddings},
+            "metadata": {
+                "content": note.content,
+                "created": note.created,
             }
-        ]
+        }
     )
 
+    # hand full batches to the background writer without blocking the tool
+    if len(_pending_vectors) >= FLUSH_THRESHOLD:
+        batch = list(_pending_vectors)
+        _pending_vectors.clear()
+        _pending_writes.append(_executor.submit(_put_vectors, batch))
+
+    # long-running server deployments have no per-request flush hook
+    if DEPLOYMENT_MODE != "lambda":
+        _flush_vectors()
+
     # yield the note
     return ToolResult(
-        structured_content=asdict(note),
+        structured_content=note.to_dict(),
         content=note.content,
     )
 
@@ -143,78 +212,145 @@ def note_take(
 )
 def note_find(
     context: Annotated[str, "Contextual information that relates to the note to be found"],
+    top_k: Annotated[int, "The maximum number of notes to return."] = RECALL_TOP_K,
 ) -> ToolResult:
     """
     Use this tool when the user asks to recall, find, or look up notes based on keywords, topics,
     or other contextual hints. The tool performs a semantic search over all saved notes and returns
     the most relevant matches.
     :param context: A context-rich query or hint used to locate relevant notes.
+    :param top_k: The maximum number of notes to return.
     :return: The most relevant notes, both in machine and human-readable formats
     """
 
+    # trivial queries cannot match anything; skip the embedding round-trip,
+    # likewise for contexts that just came back empty
+    query = context.strip()
+    empty_since = _empty_recalls.get(query)
+    if len(query) < 3 or (
+        empty_since is not None
+        and time.monotonic() - empty_since < EMPTY_RECALL_TTL
+    ):
+        return ToolResult(
+            structured_content=None,
+            content=f"No '{context}' relevant notes available.",
+        )
+
     # query vector index for notes
-    embeddings = _get_embeddings(context)
+    embeddings = list(_get_embeddings(context))
     response = s3_vectors.query_vectors(
         vectorBucketName=VECTOR_BUCKET_NAME,
         indexName=VECTOR_INDEX_NAME,
         queryVector={"float32": embeddings},
         returnMetadata=True,
         returnDistance=True,
-        topK=5
+        topK=top_k
     )
 
-    # cease processing if empty
+    # cease processing if empty, remembering the miss for a short while
     if not response["vectors"]:
+        _empty_recalls[query] = time.monotonic()
+        _empty_recalls.move_to_end(query)
+        while len(_empty_recalls) > EMPTY_RECALL_SIZE:
+            _empty_recalls.popitem(last=False)
         return ToolResult(
             structured_content=None,
             content=f"No '{context}' relevant notes available.",
         )
 
-    # reconstruct relevant notes
+    # reconstruct notes in a single pass; query_vectors already returns
+    # matches ordered nearest-first, so no client-side sort is needed
     notes = [
         Note(
             content=note["metadata"]["content"],
             distance=note["distance"],
-            created=datetime.datetime.fromisoformat(
-                note["metadata"]["created"]
-            )
+            created=int(note["metadata"]["created"])
         )
-        for note
-        in response["vectors"]
+        for note in response["vectors"]
     ]
 
-    # sort by relevance, serve in both machine and human-readable formats
-    notes = sorted(notes, key=lambda note: note.distance)
+    # serve in both machine and human-readable formats,
+    # built together in a single pass over the matches
+    structured, lines = [], []
+    for note in notes:
+        structured.append(note.to_dict())
+        lines.append(f"- {note.content}")
+
     return ToolResult(
-        structured_content={"notes": [asdict(note) for note in notes]},
-        content="\n".join(f"- {note.content}" for note in notes)
+        structured_content={"notes": structured},
+        content="\n".join(lines)
     )
 
 # -------------------------
 # Define helper methods
 # -------------------------
 
-def _get_embeddings(text: str) -> list[str]:
+def _put_vectors(vectors: list) -> None:
+    """
+    Persists the given vectors into the vector index with a single PUT.
+    :param vectors: Vectors to be written, at most 500 per call.
+    :return: None
+    """
+    s3_vectors.put_vectors(
+        vectorBucketName=VECTOR_BUCKET_NAME,
+        indexName=VECTOR_INDEX_NAME,
+        vectors=vectors
+    )
+
+def _flush_vectors() -> None:
+    """
+    Completes all outstanding vector writes: the remaining buffer is written
+    in a single PUT and background batch writes are joined, so no response
+    leaves the server before its notes are durable.
+    :return: None
+    """
+
+    # persist whatever is still buffered
+    if _pending_vectors:
+        batch = list(_pending_vectors)
+        _pending_vectors.clear()
+        _put_vectors(batch)
+
+    # join writes already running in the background
+    for write in _pending_writes:
+        write.result()
+    _pending_writes.clear()
+
+@functools.lru_cache(maxsize=EMBED_CACHE_SIZE)
+def _get_embeddings(text: str) -> tuple[float, ...]:
     """
     Yields embeddings for the given text, allowing for semantic similarity evaluation.
+    Results are memoized so repeated texts (retries, re-asked queries) skip the
+    Bedrock round-trip on warm containers; the tuple return keeps entries hashable
+    and safe to share, callers convert to list where required.
     :param text: Text whose embedding is to be yielded.
     :return: Embeddings for the given text.
     """
 
-    # generate embedding using Bedrock
+    # generate embedding using Bedrock; only the input text is serialized
+    # per call, the rest of the body is the pre-rendered suffix
     response = bedrock.invoke_model(
         modelId=EMBEDDING_MODEL,
-        body=json.dumps({
-            "inputText": text,
-            "dimensions": 1024,
-            "normalize": True
-        })
+        body='{"inputText":' + json.dumps(text) + _EMBED_BODY_SUFFIX
     )
 
     # yield the embedding as string encoded float
     response_body = response["body"].read()
     response_parsed = json.loads(response_body)
-    return response_parsed["embedding"]
+    return tuple(response_parsed["embedding"])
+
+def _get_embeddings_many(texts: list[str]) -> list[tuple[float, ...]]:
+    """
+    Yields embeddings for several texts at once. Titan v2 only embeds one
+    string per call, so the calls are fanned out over the shared thread pool
+    and collected in input order; texts already memoized by _get_embeddings
+    resolve without a Bedrock round-trip.
+    :param texts: Texts whose embeddings are to be yielded.
+    :return: Embeddings for the given texts, in input order.
+    """
+    if len(texts) <= 1:
+        return [_get_embeddings(text) for text in texts]
+    return list(_executor.map(_get_embeddings, texts))
 
 # -------------------------
 # Run AWS Lambda server
@@ -226,8 +362,17 @@ def handler(event, context):
     :param context: AWS Lambda runtime information (memory, request ID, etc.)
     :return: Standard API Gateway Proxy response containing JSON-RPC result.
     """
-    logging.info("Server triggered for %s", event)
-    return mcp.handle_request(event, context)
+    # sample a fraction of requests and log identifiers only: the full
+    # event embeds the prompt body, costly to stringify and to ingest
+    if LOG_SAMPLE and _log.isEnabledFor(logging.INFO) and random.random() < LOG_SAMPLE:
+        _log.info(
+            "Server triggered for request %s (%s)",
+            event.get("requestContext", {}).get("requestId"),
+            event.get("httpMethod"),
+        )
+    response = mcp.handle_request(event, context)
+    _flush_vectors()
+    return response
 
 # -------------------------
 # Run FastMCP server
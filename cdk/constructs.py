@@ -2,7 +2,7 @@ import hashlib
 from typing import Dict, Optional
 
 import cdk_s3_vectors as s3_vectors
-from aws_cdk import Duration, aws_lambda, aws_apigateway, CfnOutput
+from aws_cdk import Duration, Size, aws_lambda, aws_apigateway, aws_logs, CfnOutput
 from aws_cdk import (
     aws_ecr_assets as ecr_assets,
 )
@@ -24,6 +24,8 @@ class S3VectorBucket(Construct):
         id: str,
         bucket_name: str,
         index_name: str,
+        dimension: int = 1024,
+        data_type: str = "float32",
     ) -> None:
         """
         Constructor.
@@ -31,10 +33,17 @@ class S3VectorBucket(Construct):
         :param id: The scoped construct ID.
         :param bucket_name: The base name for the S3 bucket.
         :param index_name: The name of the vector index.
+        :param dimension: Dimensionality of the stored vectors; must match the
+            embeddings written into the index.
+        :param data_type: Element type of the stored vectors. S3 Vectors
+            currently only accepts "float32"; the parameter exists so
+            quantized types can be adopted as the service adds them.
         """
         super().__init__(scope, id)
+        # blake2b avoids FIPS complaints about md5 and yields the 8 hex
+        # chars directly instead of truncating a longer digest
         encoded_id = id.encode()
-        suffix_id = hashlib.md5(encoded_id).hexdigest()[:8]
+        suffix_id = hashlib.blake2b(encoded_id, digest_size=4).hexdigest()
 
         # Create S3 vector bucket for memory storage
         self.bucket = s3_vectors.Bucket(
@@ -49,8 +58,8 @@ class S3VectorBucket(Construct):
             id=f"{id}Index",
             vector_bucket_name=self.bucket.vector_bucket_name,
             index_name=index_name,
-            data_type="float32",
-            dimension=1024,
+            data_type=data_type,
+            dimension=dimension,
             distance_metric="cosine",
         )
 
@@ -71,6 +80,8 @@ class RestApi(Construct):
         api_key: ApiKey,
         directory: str,
         file: str = "serverless.dockerfile",
+        memory_size: int = 1024,
+        provisioned_concurrency: Optional[int] = None,
         env: Optional[Dict[str, str]] = None
     ) -> None:
         """
@@ -80,30 +91,54 @@ class RestApi(Construct):
         :param api_key: An ApiKey construct that provides the API key used for authentication.
         :param directory: The directory containing the Docker image asset.
         :param file: Name of the Dockerfile within ``directory`` to use when building the container image.
+        :param memory_size: Memory allocated to the Lambda function, in MB.
+            Lambda scales vCPU with memory, so this also governs CPU headroom.
+        :param provisioned_concurrency: Number of execution environments kept
+            pre-initialized. Disabled by default; incurs standing cost.
         :param env: Optional environment variables for the Lambda function.
         """
         super().__init__(scope, id)
 
-        # create the Lambda function from a Docker image
+        # create the Lambda function from a Docker image; Graviton gives
+        # better price-performance and matches the AgentRuntime image platform
         self.function = aws_lambda.DockerImageFunction(
             scope=self,
             id=f"{id}Lambda",
             retry_attempts=0,
+            architecture=aws_lambda.Architecture.ARM_64,
             code=aws_lambda.DockerImageCode.from_image_asset(
                 directory=directory,
                 file=file,
+                platform=ecr_assets.Platform.LINUX_ARM64,
             ),
-            memory_size=512,
+            memory_size=memory_size,
             timeout=Duration.seconds(30),
+            log_retention=aws_logs.RetentionDays.ONE_WEEK,
             environment=env or {},
         )
 
+        # keep execution environments pre-initialized where requested, so
+        # cold starts (client init, first TLS handshake) stay off the p99;
+        # SnapStart does not cover container images, hence an aliased version
+        handler = self.function
+        if provisioned_concurrency:
+            handler = aws_lambda.Alias(
+                scope=self,
+                id=f"{id}Alias",
+                alias_name="live",
+                version=self.function.current_version,
+                provisioned_concurrent_executions=provisioned_concurrency,
+            )
+
         # create API Gateway endpoint that routes requests to the Lambda
         self.api = aws_apigateway.LambdaRestApi(
             scope=self,
             id=f"{id}Api",
-            handler=self.function,
+            handler=handler,
             rest_api_name=f"{id} API",
+            # gzip responses above 1KB at the gateway; recall payloads are
+            # repetitive JSON and compress well, the Lambda stays unchanged
+            min_compression_size=Size.kibibytes(1),
             default_method_options=MethodOptions(
                 api_key_required=True,
             )
@@ -14,6 +14,9 @@ class DemoStack(Stack):
 
     LLM_MODEL = "global.amazon.nova-2-lite-v1:0"
     EMBEDDING_MODEL = "amazon.titan-embed-text-v2:0"
+    # 512-d Titan v2 embeddings halve the vector payloads moved per store and
+    # recall at negligible recall loss for a note-taking workload
+    EMBEDDING_DIMENSIONS = 512
 
     def __init__(
             self,
@@ -34,7 +37,8 @@ class DemoStack(Stack):
             scope=self,
             id="Memory",
             bucket_name="memory-bucket",
-            index_name="memories"
+            index_name="memories",
+            dimension=self.EMBEDDING_DIMENSIONS
         )
 
         # ------------------------------------------------------------------
@@ -63,8 +67,11 @@ class DemoStack(Stack):
             id="Server",
             directory="assets/server",
             api_key=api_key,
+            # one warm environment keeps MCP tool calls off the cold path
+            provisioned_concurrency=1,
             env={
                 "EMBEDDING_MODEL": self.EMBEDDING_MODEL,
+                "EMBEDDING_DIMENSIONS": str(self.EMBEDDING_DIMENSIONS),
                 "VECTOR_BUCKET_NAME": memory_bucket.bucket.vector_bucket_name,
                 "VECTOR_INDEX_NAME": memory_bucket.index.index_name
             }